@@ -0,0 +1,338 @@
+# core/agent.py
+"""
+无界面生产 Agent 入口
+
+用法:
+    python -m core.agent --config agent.json
+    python -m core.agent --config agent.json --check-startup
+
+与 demo/havfs_experiment.py 的区别：
+- 不清屏、不逐条打印（--verbose 时才输出每次采样）
+- 只导入配置中选用的采集器 / 上报器
+- 设备静态信息 (型号、温度传感器路径) 缓存到磁盘，重启时跳过探测
+- 测量启动耗时，并与 startup_budget_ms 预算比较
+"""
+
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import heapq
+import importlib
+import json
+import logging
+import signal
+import sys
+
+from core.model.static_cache import DEFAULT_CACHE_PATH, load_static_cache, save_static_cache
+
+logger = logging.getLogger("havfs.agent")
+
+
+# ==========================================================
+# 组件注册表（字符串形式，按需导入）
+# ==========================================================
+
+COLLECTORS = {
+    "cpu": ("core.collector.cpu_collector", "CPUCollector"),
+    "gpu": ("core.collector.gpu_collector", "GPUCollector"),
+    "npu": ("core.collector.npu_collector", "NPUCollector"),
+}
+
+REPORTERS = {
+    "console": ("core.reporter.console_reporter", "ConsoleReporter"),
+    "prometheus": ("core.reporter.prometheus_reporter", "PrometheusReporter"),
+    "csv": ("core.reporter.csv_reporter", "CSVReporter"),
+    "rollup": ("core.reporter.rollup_reporter", "RollupReporter"),
+}
+
+DEFAULT_CONFIG = {
+    "mode": "havfs",
+    "havfs": {"t_min": 0.5, "t_max": 5.0, "static_limit": 80.0},
+    "fixed_interval": 2.0,
+    "devices": [{"type": "cpu", "device_id": "cpu0"}],
+    "reporters": [{"type": "prometheus", "port": 8000}],
+    "compression": None,
+    "burst": None,
+    "incident_export": None,
+    "static_cache": DEFAULT_CACHE_PATH,
+    "startup_budget_ms": 500,
+    "clock": None,
+    "duration": None,
+}
+
+
+def _load_class(registry, name):
+    if name not in registry:
+        raise ValueError(f"Unknown component type '{name}'. Choices: {sorted(registry)}")
+    module_name, class_name = registry[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class _WallClock:
+    """默认时钟（不依赖 numpy），now() 返回 epoch 秒，同时作为采样时间戳"""
+
+    now = staticmethod(time.time)
+
+    @staticmethod
+    def sleep(seconds):
+        # 采样耗时超过间隔时截止时刻已过，不再等待
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+# ==========================================================
+# 组件构建
+# ==========================================================
+
+def build_collectors(device_specs, static_cache, clock):
+    """根据配置构建采集器列表；sim 设备共享一个向量化模拟器"""
+    collectors = []
+    for spec in device_specs:
+        spec = dict(spec)
+        kind = spec.pop("type")
+
+        if kind == "sim":
+            from core.collector.sim_collector import build_simulated_fleet
+            collectors.extend(build_simulated_fleet(
+                spec.get("count", 1),
+                seed=spec.get("seed", 0),
+                clock=clock,
+                prefix=spec.get("prefix", "sim"),
+                tick=spec.get("tick", 1.0)
+            ))
+            continue
+
+        cls = _load_class(COLLECTORS, kind)
+        device_id = spec.get("device_id")
+        if device_id in static_cache and kind in ("cpu", "gpu"):
+            spec["static_info"] = static_cache[device_id]
+        collectors.append(cls(**spec))
+    return collectors
+
+
+def build_reporters(reporter_specs):
+    reporters = []
+    for spec in reporter_specs:
+        spec = dict(spec)
+        cls = _load_class(REPORTERS, spec.pop("type"))
+        reporters.append(cls(**spec))
+    return reporters
+
+
+def build_clock(clock_spec):
+    if not clock_spec:
+        return _WallClock()
+    from core.collector.sim_collector import VirtualClock
+    return VirtualClock(**clock_spec)
+
+
+# ==========================================================
+# Agent 主体
+# ==========================================================
+
+class Agent:
+    """
+    多设备单线程调度：按各设备下一次采样时刻维护最小堆
+
+    单个设备采集失败（如 npu-smi 无数据）只记录日志，并对该设备指数退避，
+    不影响其他设备
+    """
+
+    # 连续失败时的重试间隔：从 fixed_interval 起逐次翻倍，上限 MAX_BACKOFF 秒
+    MAX_BACKOFF = 60.0
+
+    def __init__(self, config, refresh_cache=False, verbose=False):
+        self.config = {**DEFAULT_CONFIG, **config}
+        self.verbose = verbose
+        self.clock = build_clock(self.config["clock"])
+
+        cache_path = self.config["static_cache"]
+        cache = {} if (refresh_cache or not cache_path) else load_static_cache(cache_path)
+
+        self.collectors = build_collectors(self.config["devices"], cache, self.clock)
+        self.reporters = build_reporters(self.config["reporters"])
+
+        # 压缩，如 {"error_bound": 1.0, "max_gap": 60}：
+        # 线性插值的下游 (CSV) 走旋转门；保持上一个值的下游 (Prometheus、分层降采样) 走死区
+        if self.config["compression"]:
+            from core.reporter.compression_reporter import SwingingDoorReporter
+            groups = {
+                "swinging_door": [r for r in self.reporters if not r.holds_last_value],
+                "deadband": [r for r in self.reporters if r.holds_last_value],
+            }
+            reporters = self.reporters
+            self.reporters = [
+                SwingingDoorReporter(group, clock=self.clock.now, mode=mode, **self.config["compression"])
+                for mode, group in groups.items() if group
+            ]
+            # 压缩率导出到 Prometheus（如配置了该上报器）
+            for reporter in reporters:
+                if hasattr(reporter, "track_compression"):
+                    reporter.track_compression(self.reporters)
+
+        if self.config["mode"] == "havfs":
+            from core.scheduler.havfs import HAVFS
+            self.schedulers = [HAVFS(**self.config["havfs"]) for _ in self.collectors]
+        else:
+            self.schedulers = [None] * len(self.collectors)
+
+        # 突发捕获：进入 HIGH 时高频采样利用率，如 {"rate_hz": 50, "window": 5.0, "max_active": 4}
+        # 全部设备共享一个采样线程 (BurstPool)
+        self.bursts = [None] * len(self.collectors)
+        self.burst_pool = None
+        # 纯虚拟时钟下 sleep 不耗真实时间，高频捕获没有意义，跳过
+        if self.config["burst"] and self.config["mode"] == "havfs":
+            if getattr(self.clock, "speedup", 1.0) is None:
+                logger.warning("[Agent] burst capture disabled: not supported with a virtual clock (speedup=None)")
+            else:
+                from core.scheduler.burst import BurstPool, BurstSampler
+                self.burst_pool = BurstPool(clock=self.clock, **self.config["burst"])
+                self.bursts = [
+                    BurstSampler(c, c.device_id, self.burst_pool, on_capture=s.buffer.attach)
+                    for c, s in zip(self.collectors, self.schedulers)
+                ]
+
+        # 高风险窗口导出：如 {"root": "experiments/incidents", "flush_interval": 10}
+        self.exporter = None
+        if self.config["incident_export"] and self.config["mode"] == "havfs":
+            from core.storage.incident_export import IncidentExporter
+            self.exporter = IncidentExporter(**self.config["incident_export"])
+            for c, s in zip(self.collectors, self.schedulers):
+                self.exporter.register(c.device_id, s.buffer)
+            self.exporter.start()
+
+        # 仅在发现结果变化时回写缓存
+        if cache_path:
+            # 探测失败的设备 static_info 为 None，不入缓存（下次启动会重新探测）
+            infos = [c.static_info for c in self.collectors if getattr(c, "static_info", None)]
+            if {info.device_id: info for info in infos} != cache:
+                save_static_cache(infos, cache_path)
+
+        self.failures = [0] * len(self.collectors)
+
+        self.startup_ms = (time.perf_counter() - _T0) * 1000.0
+
+    def check_startup(self) -> bool:
+        """启动预算检查：返回是否在预算内（预算未配置视为通过）"""
+        budget = self.config["startup_budget_ms"]
+        ok = budget is None or self.startup_ms <= budget
+        log = logger.info if ok else logger.warning
+        log("[Agent] startup %.1f ms (budget %s ms)", self.startup_ms, budget)
+        return ok
+
+    def sample(self, index):
+        """对单个设备执行一次 采集→调度→上报，返回下一次采样间隔"""
+        metrics = self.collectors[index].collect()
+        if metrics.timestamp is None:
+            metrics.timestamp = self.clock.now()
+
+        scheduler = self.schedulers[index]
+        if scheduler is None:
+            interval, risk, state = self.config["fixed_interval"], 0.0, "固定频率"
+        else:
+            interval, risk, state = scheduler.update(metrics)
+            if self.bursts[index] is not None:
+                self.bursts[index].observe(scheduler.state)
+
+        for reporter in self.reporters:
+            reporter.send(metrics, risk, interval, state)
+
+        if self.verbose:
+            logger.info("[Sample] %s: %s risk=%.2f interval=%.2f state=%s",
+                        metrics.device_id, metrics.summary(), risk, interval, state)
+        return interval
+
+    def sample_or_backoff(self, index):
+        """sample() 的容错版本：失败时记录日志并返回退避后的重试间隔"""
+        try:
+            interval = self.sample(index)
+        except Exception as e:
+            n = self.failures[index] = self.failures[index] + 1
+            delay = min(self.config["fixed_interval"] * 2 ** (n - 1), self.MAX_BACKOFF)
+            logger.warning("[Agent] %s sample failed (%d in a row), retry in %.1fs: %s",
+                           self.collectors[index].device_id, n, delay, e)
+            return delay
+
+        if self.failures[index]:
+            logger.info("[Agent] %s recovered after %d failures",
+                        self.collectors[index].device_id, self.failures[index])
+            self.failures[index] = 0
+        return interval
+
+    def run(self):
+        duration = self.config["duration"]
+        start = self.clock.now()
+        end = None if duration is None else start + duration
+
+        heap = [(start, i) for i in range(len(self.collectors))]
+        heapq.heapify(heap)
+
+        try:
+            while heap:
+                due, index = heapq.heappop(heap)
+                if end is not None and due >= end:
+                    break
+                self.clock.sleep(due - self.clock.now())
+                interval = self.sample_or_backoff(index)
+                heapq.heappush(heap, (self.clock.now() + interval, index))
+        finally:
+            self.close()
+
+    def close(self):
+        if self.burst_pool is not None:
+            self.burst_pool.close()
+        if self.exporter is not None:
+            self.exporter.close()
+        for reporter in self.reporters:
+            reporter.close()
+
+
+# ==========================================================
+# 命令行入口
+# ==========================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HAVFS headless agent")
+    parser.add_argument("--config", type=str, default=None, help="JSON 配置文件路径")
+    parser.add_argument("--duration", type=float, default=None, help="运行时长 (s)，默认一直运行")
+    parser.add_argument("--verbose", action="store_true", help="输出每次采样")
+    parser.add_argument("--refresh-cache", action="store_true", help="忽略并重建设备静态信息缓存")
+    parser.add_argument("--check-startup", action="store_true",
+                        help="完成初始化与一轮采集后退出，超出启动预算时返回码为 1")
+    return parser.parse_args(argv)
+
+
+def _on_sigterm(signum, frame):
+    raise SystemExit(0)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+    if args.duration is not None:
+        config["duration"] = args.duration
+
+    agent = Agent(config, refresh_cache=args.refresh_cache, verbose=args.verbose)
+
+    if args.check_startup:
+        for i in range(len(agent.collectors)):
+            agent.sample_or_backoff(i)
+        agent.startup_ms = (time.perf_counter() - _T0) * 1000.0
+        agent.close()
+        return 0 if agent.check_startup() else 1
+
+    agent.check_startup()
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    agent.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
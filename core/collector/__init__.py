@@ -1,5 +1,22 @@
 # core/collector/__init__.py
+# 按需导入：只有真正用到的采集器才会加载其依赖 (psutil / pynvml / numpy)
 
-from .cpu_collector import CPUCollector
-from .gpu_collector import GPUCollector
-from .npu_collector import NPUCollector
+import importlib
+
+_EXPORTS = {
+    "CPUCollector": ".cpu_collector",
+    "GPUCollector": ".gpu_collector",
+    "NPUCollector": ".npu_collector",
+    "SimulatedCollector": ".sim_collector",
+    "WorkloadSimulator": ".sim_collector",
+    "VirtualClock": ".sim_collector",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    return getattr(module, name)
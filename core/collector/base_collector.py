@@ -16,3 +16,10 @@ class BaseCollector(ABC):
         采集一次设备动态指标
         """
         pass
+
+    def sample_utilization(self) -> float:
+        """
+        只读取利用率（突发捕获高频调用）
+        默认走完整 collect()，子类可覆盖为更廉价的实现
+        """
+        return self.collect().utilization
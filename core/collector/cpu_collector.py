@@ -1,34 +1,86 @@
 # core/collector/cpu_collector.py
 
+import glob
+import os
+import platform
 import psutil
 import random
 from core.collector.base_collector import BaseCollector
-from core.model.base_xpu import XPUDynamicMetrics
+from core.model.base_xpu import XPUDynamicMetrics, XPUStaticInfo
 
 
 class CPUCollector(BaseCollector):
     """
     CPU 指标采集器（真实采集）
     数据来源：psutil
+
+    static_info 可由 Agent 从磁盘缓存传入，跳过传感器发现过程；
+    缓存中没有传感器 (上次发现失败) 时仍重新发现，不沿用失败结果
     """
 
-    def __init__(self, device_id="cpu0"):
+    def __init__(self, device_id="cpu0", static_info=None):
         self.device_id = device_id
+        if static_info is None or static_info.sensor is None:
+            static_info = self._discover()
+        self.static_info = static_info
+
+    def _discover(self) -> XPUStaticInfo:
+        """发现温度传感器：优先定位 hwmon 文件路径，之后每次采集直接读文件"""
+        sensor = None
+        try:
+            temps = psutil.sensors_temperatures()
+            if temps:
+                # 取第一个温度传感器
+                sensor = list(temps.keys())[0]
+                for name_file in sorted(glob.glob("/sys/class/hwmon/hwmon*/name")):
+                    with open(name_file) as f:
+                        if f.read().strip() == sensor:
+                            path = os.path.join(os.path.dirname(name_file), "temp1_input")
+                            if os.path.exists(path):
+                                sensor = path
+                            break
+        except Exception:
+            sensor = None
+
+        return XPUStaticInfo(
+            device_id=self.device_id,
+            device_type="CPU",
+            vendor=platform.system(),
+            model=platform.processor() or platform.machine(),
+            sensor=sensor
+        )
+
+    def _read_temperature(self):
+        sensor = self.static_info.sensor
+        if sensor is None:
+            return None
+
+        # 缓存的 hwmon 路径：直接读取 (单位 m°C)
+        if sensor.startswith("/"):
+            try:
+                with open(sensor) as f:
+                    return int(f.read()) / 1000.0
+            except (OSError, ValueError):
+                # 重启后 hwmon 编号可能变化，重新发现
+                self.static_info = self._discover()
+                return None
+
+        # 传感器键名：走 psutil
+        try:
+            entries = psutil.sensors_temperatures().get(sensor)
+            return entries[0].current if entries else None
+        except Exception:
+            return None
+
+    def sample_utilization(self) -> float:
+        return psutil.cpu_percent(interval=None)
 
     def collect(self) -> XPUDynamicMetrics:
         # CPU利用率（真实）
         utilization = psutil.cpu_percent(interval=None)
 
         # 温度（部分机器支持）
-        temperature = None
-        try:
-            temps = psutil.sensors_temperatures()
-            if temps:
-                # 取第一个温度传感器
-                first_key = list(temps.keys())[0]
-                temperature = temps[first_key][0].current
-        except:
-            temperature = None
+        temperature = self._read_temperature()
 
         # 功耗（CPU一般无法直接获取，论文阶段可模拟）
         power = 30 + utilization * 0.5
@@ -1,43 +1,65 @@
-import random
 import logging
 from core.collector.base_collector import BaseCollector
-from core.model.base_xpu import XPUDynamicMetrics
+from core.model.base_xpu import XPUDynamicMetrics, XPUStaticInfo
+
+logger = logging.getLogger(__name__)
+
+# pynvml 延迟到首次构造 GPUCollector 时才导入，避免拖慢不使用 GPU 的进程启动
+pynvml = None
+HAS_NVML = None
+
+
+def _load_nvml():
+    """尝试导入 pynvml，如果环境不支持则标记为不可用"""
+    global pynvml, HAS_NVML
+    if HAS_NVML is None:
+        try:
+            import pynvml as _pynvml
+            pynvml = _pynvml
+            HAS_NVML = True
+        except ImportError:
+            HAS_NVML = False
+    return HAS_NVML
 
-# 尝试导入 pynvml，如果环境不支持则标记为不可用
-try:
-    import pynvml
-    HAS_NVML = True
-except ImportError:
-    HAS_NVML = False
 
 class GPUCollector(BaseCollector):
     """
     真实GPU采集器 (兼容模拟模式)
     自动检测环境：如果有 NVIDIA 驱动则采集真实数据，否则回退到模拟数据。
+    缓存的 static_info 只省去型号查询，NVML 总会重新探测；
+    探测失败时 static_info 为 None，不会被写入缓存。
     """
 
-    def __init__(self, device_id="gpu0", gpu_index=0):
+    def __init__(self, device_id="gpu0", gpu_index=0, static_info=None):
         self.device_id = device_id
         self.gpu_index = gpu_index
         self.use_real_gpu = False
         self.handle = None
+        self.simulator = None
+        self.static_info = static_info if static_info is not None and static_info.vendor == "NVIDIA" else None
 
-        if HAS_NVML:
+        if _load_nvml():
             try:
                 pynvml.nvmlInit()
                 # 获取指定索引的GPU句柄
                 self.handle = pynvml.nvmlDeviceGetHandleByIndex(self.gpu_index)
-                gpu_name = pynvml.nvmlDeviceGetName(self.handle)
-                # 兼容不同版本的 pynvml 返回 bytes 或 str 的情况
-                if isinstance(gpu_name, bytes):
-                    gpu_name = gpu_name.decode("utf-8")
-                    
-                print(f"[GPU] Detected NVIDIA GPU: {gpu_name}")
                 self.use_real_gpu = True
+                if self.static_info is None:
+                    gpu_name = pynvml.nvmlDeviceGetName(self.handle)
+                    # 兼容不同版本的 pynvml 返回 bytes 或 str 的情况
+                    if isinstance(gpu_name, bytes):
+                        gpu_name = gpu_name.decode("utf-8")
+                    self.static_info = XPUStaticInfo(
+                        device_id=device_id, device_type="GPU", vendor="NVIDIA", model=gpu_name
+                    )
+                logger.info("[GPU] Detected NVIDIA GPU: %s", self.static_info.model)
             except pynvml.NVMLError as e:
-                print(f"[GPU] NVML Init failed ({e}). Fallback to simulation.")
+                logger.warning("[GPU] NVML Init failed (%s). Fallback to simulation.", e)
         else:
-            print("[GPU] 'nvidia-ml-py' not installed. Fallback to simulation.")
+            logger.warning("[GPU] 'nvidia-ml-py' not installed. Fallback to simulation.")
+
+        if not self.use_real_gpu:
+            self.static_info = None
 
     def collect(self) -> XPUDynamicMetrics:
         """根据环境决定调用真实采集还是模拟采集"""
@@ -46,6 +68,15 @@ class GPUCollector(BaseCollector):
         else:
             return self._collect_simulated()
 
+    def sample_utilization(self) -> float:
+        """仅查询 GPU 利用率（单次 NVML 调用）"""
+        if self.use_real_gpu:
+            try:
+                return float(pynvml.nvmlDeviceGetUtilizationRates(self.handle).gpu)
+            except pynvml.NVMLError:
+                pass
+        return self._collect_simulated().utilization
+
     def _collect_real(self) -> XPUDynamicMetrics:
         """调用 NVML 获取真实指标"""
         try:
@@ -81,21 +112,17 @@ class GPUCollector(BaseCollector):
                 bandwidth=0.0 # 带宽通常需要更底层的计数器，暂置0
             )
         except pynvml.NVMLError as e:
-            print(f"[GPU] Error collecting data: {e}")
+            logger.warning("[GPU] Error collecting data: %s", e)
             # 采集失败时临时回退到模拟数据，防止程序崩溃
             return self._collect_simulated()
 
     def _collect_simulated(self) -> XPUDynamicMetrics:
-        """原有模拟逻辑：生成随机波动数据"""
-        util = random.uniform(10, 90)
-        return XPUDynamicMetrics(
-            device_id=self.device_id,
-            utilization=util,
-            temperature=random.uniform(40, 80),
-            power=random.uniform(50, 200),
-            memory_usage=random.uniform(10, 90),
-            bandwidth=random.uniform(100, 800)
-        )
+        """模拟逻辑：由可复现的合成负载模拟器生成带时间相关性的数据"""
+        if self.simulator is None:
+            from core.collector.sim_collector import VirtualClock, WorkloadSimulator
+            self.simulator = WorkloadSimulator(1, seed=self.gpu_index, clock=VirtualClock())
+        self.simulator.advance()
+        return self.simulator.metrics(0, self.device_id)
 
     def __del__(self):
         """析构时关闭 NVML"""
@@ -1,21 +1,178 @@
 # core/collector/npu_collector.py
 
+import logging
+import math
+import re
+import subprocess
+import threading
+import time
+
 from core.collector.base_collector import BaseCollector
-from core.model.base_xpu import XPUDynamicMetrics
+from core.model.base_xpu import XPUDynamicMetrics, XPUStaticInfo
+
+logger = logging.getLogger(__name__)
+
+
+# `npu-smi info watch` 数据行：
+# NpuID(Idx)  ChipId(Idx) Pwr(W)  Temp(C)  AI Core(%)  AI Cpu(%)  Ctrl Cpu(%)  Memory(%)  Memory BW(%)
+# 0           0           69.5    45       12          0          3            8          1
+_NUM = r"(\d+(?:\.\d+)?|NA|-)"
+_ROW_RE = re.compile(r"^\s*(\d+)\s+(\d+)\s+" + r"\s+".join([_NUM] * 7) + r"\s*$")
 
 
+def _num(token):
+    return None if token in ("NA", "-") else float(token)
+
+
+def parse_watch_line(line):
+    """
+    解析一行 watch 输出
+    返回 (npu_id, chip_id, power, temp, aicore, aicpu, ctrlcpu, memory, memory_bw)；
+    表头 / 空行 / 无法识别的行返回 None
+    """
+    m = _ROW_RE.match(line)
+    if m is None:
+        return None
+    g = m.groups()
+    return (int(g[0]), int(g[1])) + tuple(_num(x) for x in g[2:])
+
+
+# ==========================================================
+# npu-smi 常驻流（所有 NPU 共享一个子进程）
+# ==========================================================
+
+class NPUSmiStream:
+    """
+    常驻运行 `npu-smi info watch`，后台线程逐行解析，
+    按 (npu_id, chip_id) 保存最新一行，采集时只读内存
+
+    - 同一命令只启动一个子进程（见 shared()），一轮输出覆盖全部设备
+    - 子进程退出后自动重启
+    - 每行记录接收时刻；超过 stale_after 秒未刷新的行视为缺数
+      （npu-smi 卡死时不会持续返回冻结的旧值）
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    # 启动后等待第一轮输出的最长时间 (s)；此后读取不再等待
+    STARTUP_TIMEOUT = 3.0
+
+    def __init__(self, npu_smi="npu-smi", delay=1, stale_after=None):
+        self.cmd = [npu_smi, "info", "watch", "-d", str(delay)]
+        self._ready_deadline = time.monotonic() + self.STARTUP_TIMEOUT
+        self.stale_after = stale_after if stale_after is not None else max(3.0 * delay, 5.0)
+        # (npu_id, chip_id) -> (接收时刻 monotonic, row)
+        self.latest = {}
+        self.failed = False
+        self.proc = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="npu-smi-watch", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls, npu_smi="npu-smi", delay=1, stale_after=None):
+        key = (npu_smi, delay)
+        with cls._instances_lock:
+            stream = cls._instances.get(key)
+            if stream is None:
+                stream = cls._instances[key] = cls(npu_smi, delay, stale_after)
+            return stream
+
+    def _run(self):
+        while not self._closed:
+            try:
+                self.proc = subprocess.Popen(
+                    self.cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    text=True, bufsize=1
+                )
+            except OSError as e:
+                logger.warning("[NPU] Failed to start %s: %s", self.cmd[0], e)
+                self.failed = True
+                return
+
+            latest = self.latest
+            for line in self.proc.stdout:
+                row = parse_watch_line(line)
+                if row is not None:
+                    latest[(row[0], row[1])] = (time.monotonic(), row)
+
+            self.proc.wait()
+            if not self._closed:
+                logger.warning("[NPU] %s exited (code %s), restarting", self.cmd[0], self.proc.returncode)
+                time.sleep(1.0)
+
+    def _fresh(self, key):
+        entry = self.latest.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.stale_after:
+            return None
+        return entry[1]
+
+    def get(self, npu_id, chip_id):
+        """
+        读取最新一行；无数据（未出现或已过期）返回 None
+        仅在流刚启动、第一轮输出尚未到达时最多等待 STARTUP_TIMEOUT 秒，
+        之后立即返回，不阻塞单线程调度的其他设备
+        """
+        key = (npu_id, chip_id)
+        row = self._fresh(key)
+        while row is None and not self.failed and time.monotonic() < self._ready_deadline:
+            time.sleep(0.01)
+            row = self._fresh(key)
+        return row
+
+    def close(self):
+        self._closed = True
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+
+
+# ==========================================================
+# 采集器
+# ==========================================================
+
 class NPUCollector(BaseCollector):
     """
-    NPU采集器（接口占位）
+    昇腾 NPU 采集器
+    数据来源：常驻 `npu-smi info watch` 流（不再每次采样启动子进程）
 
-    论文阶段说明：
-    - 支持未来昇腾/寒武纪等NPU设备扩展
+    npu_smi 可指向 tools/fake_npu_smi.py，在无 NPU 的 Linux 机器上测试
     """
 
-    def __init__(self, device_id="npu0"):
+    def __init__(self, device_id="npu0", npu_id=0, chip_id=0, npu_smi="npu-smi", delay=1,
+                 stale_after=None, stream=None):
         self.device_id = device_id
+        self.npu_id = npu_id
+        self.chip_id = chip_id
+        self.stream = stream or NPUSmiStream.shared(npu_smi, delay, stale_after)
+        self.static_info = XPUStaticInfo(
+            device_id=device_id, device_type="NPU", vendor="Huawei", model="Ascend"
+        )
+
+    def sample_utilization(self) -> float:
+        # 受 watch 刷新周期限制，高于 1/delay 的采样率只会读到重复值
+        # 无数据或 AI Core 为 NA 时返回 NaN，由调用方跳过
+        row = self.stream.get(self.npu_id, self.chip_id)
+        if row is None or row[4] is None:
+            return math.nan
+        return row[4]
 
     def collect(self) -> XPUDynamicMetrics:
-        raise NotImplementedError(
-            "NPUCollector is a stub for future hardware support."
+        row = self.stream.get(self.npu_id, self.chip_id)
+        if row is None:
+            raise RuntimeError(
+                f"No fresh npu-smi data for NPU {self.npu_id} chip {self.chip_id}"
+            )
+        _, _, power, temp, aicore, _, _, memory, memory_bw = row
+        if aicore is None:
+            raise RuntimeError(
+                f"npu-smi reports no AI Core utilization (NA) for NPU {self.npu_id} chip {self.chip_id}"
+            )
+        return XPUDynamicMetrics(
+            device_id=self.device_id,
+            utilization=aicore,
+            temperature=temp,
+            power=power,
+            memory_usage=memory,
+            bandwidth=memory_bw
         )
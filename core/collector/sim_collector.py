@@ -0,0 +1,261 @@
+# core/collector/sim_collector.py
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.collector.base_collector import BaseCollector
+from core.model.base_xpu import XPUDynamicMetrics
+
+
+# ==========================================================
+# 虚拟时钟（支持实时 / 加速 / 纯虚拟三种推进方式）
+# ==========================================================
+
+class VirtualClock:
+    """
+    虚拟时钟：压测时替代 time.time() / time.sleep()
+
+    - speedup=1.0      : 与墙钟同速（实时）
+    - speedup=60.0     : 加速 60 倍（1 分钟负载 1 秒跑完）
+    - speedup=None     : 纯虚拟时间，sleep 立即返回并直接推进时钟
+    """
+
+    def __init__(self, speedup=1.0, start=0.0):
+        self.speedup = speedup
+        self._virtual = start
+        self._wall_start = time.monotonic()
+
+    def now(self) -> float:
+        if self.speedup is None:
+            return self._virtual
+        return self._virtual + (time.monotonic() - self._wall_start) * self.speedup
+
+    def sleep(self, seconds: float):
+        if seconds <= 0:
+            return
+        if self.speedup is None:
+            self._virtual += seconds
+        else:
+            time.sleep(seconds / self.speedup)
+
+
+# ==========================================================
+# 负载画像（各类负载模式的参数）
+# ==========================================================
+
+@dataclass
+class WorkloadProfile:
+    """
+    合成负载参数：基线 + 日周期 + 突发 + 阶跃 + 检查点尖峰 + 机架级关联事件
+    速率类参数单位均为 “次/秒/设备”（机架事件为 “次/秒/机架”）
+    """
+    # 基线与平滑噪声 (AR(1))
+    base_util: float = 35.0
+    noise_std: float = 3.0
+    noise_tau: float = 10.0             # 噪声相关时间 (s)
+
+    # 日周期
+    diurnal_amplitude: float = 15.0
+    diurnal_period: float = 86400.0
+
+    # 突发 (泊松到达, 指数持续)
+    burst_rate: float = 1.0 / 600
+    burst_amplitude: float = 40.0
+    burst_duration: float = 20.0
+
+    # 阶跃 (作业切换导致的基线漂移)
+    step_rate: float = 1.0 / 1800
+    step_amplitude: float = 20.0
+
+    # 周期性检查点尖峰
+    checkpoint_period: float = 900.0
+    checkpoint_duration: float = 15.0
+    checkpoint_amplitude: float = 30.0
+
+    # 机架级关联事件 (同机架设备同时受影响)
+    rack_size: int = 8
+    rack_event_rate: float = 1.0 / 3600
+    rack_event_amplitude: float = 35.0
+    rack_event_duration: float = 60.0
+
+
+# ==========================================================
+# 向量化负载生成器
+# ==========================================================
+
+class WorkloadSimulator:
+    """
+    合成负载模拟器（可复现）
+
+    - 一次 step() 以 NumPy 向量化方式推进所有虚拟设备
+    - 相同 seed + 相同时间序列 => 完全相同的输出
+    - 多个 SimulatedCollector 共享同一模拟器，按时钟惰性推进
+    - 时钟被量化为固定节拍 tick：只有跨过节拍边界才推进整个设备群，
+      采集本身是 O(1)，且轨迹与采集时序无关（同 seed 总是按同样的 tick 步进）
+    - 推进与读取由 lock 保护，主循环与突发捕获线程可并发采集
+    """
+
+    def __init__(self, n_devices=1, profile=None, seed=0, clock=None, start=0.0, tick=1.0):
+        self.n_devices = n_devices
+        self.profile = profile or WorkloadProfile()
+        self.clock = clock
+        self.tick = tick
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.RLock()
+
+        p = self.profile
+        n = n_devices
+        rng = self.rng
+
+        # 设备静态差异：基线偏移、日周期相位、检查点相位、突发幅度
+        self.base = p.base_util + rng.normal(0.0, 5.0, n)
+        self.diurnal_phase = rng.uniform(0.0, 2 * math.pi, n)
+        self.checkpoint_offset = rng.uniform(0.0, p.checkpoint_period, n)
+        self.burst_gain = rng.uniform(0.6, 1.0, n) * p.burst_amplitude
+
+        # 机架划分
+        self.rack_id = np.arange(n) // max(p.rack_size, 1)
+        self.n_racks = int(self.rack_id[-1]) + 1 if n else 0
+
+        # 动态状态
+        self.t = start
+        self.noise = np.zeros(n)
+        self.level = np.zeros(n)
+        self.burst_until = np.full(n, -np.inf)
+        self.rack_until = np.full(self.n_racks, -np.inf)
+        self.temperature = np.full(n, 40.0)
+        self.memory = rng.uniform(20.0, 60.0, n)
+
+        # 最近一次输出
+        self.utilization = np.clip(self.base, 0.0, 100.0)
+        self.power = np.zeros(n)
+        self.bandwidth = np.zeros(n)
+
+    # ------------------------------------------------------
+
+    def step(self, t: float):
+        """将所有设备推进到时刻 t（t 不得早于当前时刻）"""
+        dt = t - self.t
+        if dt <= 0:
+            return
+        self.t = t
+
+        p = self.profile
+        n = self.n_devices
+        rng = self.rng
+
+        # 1. AR(1) 平滑噪声：相关时间 noise_tau，平稳方差 noise_std^2
+        rho = math.exp(-dt / p.noise_tau)
+        self.noise = rho * self.noise + math.sqrt(1 - rho * rho) * p.noise_std * rng.standard_normal(n)
+
+        # 2. 阶跃：以一定概率跳到新的基线偏移
+        stepped = rng.random(n) < -math.expm1(-p.step_rate * dt)
+        if stepped.any():
+            self.level[stepped] = rng.uniform(-p.step_amplitude, p.step_amplitude, int(stepped.sum()))
+
+        # 3. 突发：泊松到达，持续时间服从指数分布
+        arrived = rng.random(n) < -math.expm1(-p.burst_rate * dt)
+        if arrived.any():
+            self.burst_until[arrived] = t + rng.exponential(p.burst_duration, int(arrived.sum()))
+        burst = np.where(self.burst_until > t, self.burst_gain, 0.0)
+
+        # 4. 机架级关联事件
+        if self.n_racks:
+            rack_hit = rng.random(self.n_racks) < -math.expm1(-p.rack_event_rate * dt)
+            if rack_hit.any():
+                self.rack_until[rack_hit] = t + p.rack_event_duration
+        rack = np.where(self.rack_until[self.rack_id] > t, p.rack_event_amplitude, 0.0)
+
+        # 5. 检查点尖峰（固定周期，设备间相位错开）
+        ckpt_active = np.fmod(t + self.checkpoint_offset, p.checkpoint_period) < p.checkpoint_duration
+        ckpt = np.where(ckpt_active, p.checkpoint_amplitude, 0.0)
+
+        # 6. 日周期
+        diurnal = p.diurnal_amplitude * np.sin(2 * math.pi * t / p.diurnal_period + self.diurnal_phase)
+
+        util = self.base + self.level + diurnal + self.noise + burst + rack + ckpt
+        self.utilization = np.clip(util, 0.0, 100.0)
+
+        # 派生指标：温度一阶惯性跟随负载，功耗/带宽与负载相关
+        k = -math.expm1(-dt / 30.0)
+        self.temperature += k * (35.0 + 0.5 * self.utilization - self.temperature)
+        self.power = 50.0 + 2.5 * self.utilization
+        self.bandwidth = np.where(ckpt_active, 800.0, 100.0 + 4.0 * self.utilization)
+        self.memory = np.clip(self.memory + 0.01 * dt * (self.utilization - 50.0) / 50.0, 5.0, 95.0)
+
+    def advance(self):
+        """按时钟推进到最近一个已经过的节拍（无时钟时不动）"""
+        if self.clock is None:
+            return
+        target = math.floor(self.clock.now() / self.tick) * self.tick
+        with self.lock:
+            while self.t + self.tick <= target:
+                self.step(self.t + self.tick)
+
+    def generate(self, duration: float, dt: float = None) -> np.ndarray:
+        """
+        离线批量生成利用率矩阵 (T, N)
+        用于大规模回放 / 压测，不经过采集接口；dt 缺省为 tick
+        """
+        dt = dt or self.tick
+        steps = int(duration / dt)
+        out = np.empty((steps, self.n_devices))
+        t0 = self.t
+        for i in range(steps):
+            self.step(t0 + (i + 1) * dt)
+            out[i] = self.utilization
+        return out
+
+    def metrics(self, index: int, device_id: str) -> XPUDynamicMetrics:
+        return XPUDynamicMetrics(
+            device_id=device_id,
+            utilization=float(self.utilization[index]),
+            temperature=float(self.temperature[index]),
+            power=float(self.power[index]),
+            memory_usage=float(self.memory[index]),
+            bandwidth=float(self.bandwidth[index])
+        )
+
+
+# ==========================================================
+# 采集器视图
+# ==========================================================
+
+class SimulatedCollector(BaseCollector):
+    """
+    虚拟设备采集器
+    - 每个实例对应模拟器中的一个设备下标
+    - collect() 时按共享时钟推进整个模拟器，再读取本设备数据
+    """
+
+    def __init__(self, simulator: WorkloadSimulator, index=0, device_id=None):
+        self.simulator = simulator
+        self.index = index
+        self.device_id = device_id or f"sim{index}"
+
+    def sample_utilization(self) -> float:
+        with self.simulator.lock:
+            self.simulator.advance()
+            return float(self.simulator.utilization[self.index])
+
+    def collect(self) -> XPUDynamicMetrics:
+        with self.simulator.lock:
+            self.simulator.advance()
+            return self.simulator.metrics(self.index, self.device_id)
+
+
+def build_simulated_fleet(n_devices, seed=0, clock=None, profile=None, prefix="sim", tick=1.0):
+    """
+    创建 n_devices 个共享同一模拟器的虚拟设备采集器
+    模拟从时钟当前节拍开始（墙钟为 epoch 秒，不能从 0 逐 tick 追赶）
+    """
+    start = math.floor(clock.now() / tick) * tick if clock is not None else 0.0
+    simulator = WorkloadSimulator(n_devices, profile=profile, seed=seed, clock=clock, start=start, tick=tick)
+    return [
+        SimulatedCollector(simulator, index=i, device_id=f"{prefix}{i}")
+        for i in range(n_devices)
+    ]
@@ -17,6 +17,7 @@ class XPUStaticInfo:
     device_type: str   # CPU / GPU / NPU
     vendor: str = "Generic"
     model: str = "Unknown"
+    sensor: Optional[str] = None   # 温度传感器路径/键（启动时发现并缓存）
 
 
 # ==========================================================
@@ -40,6 +41,9 @@ class XPUDynamicMetrics:
     # 设备标识
     device_id: str = "0"
 
+    # 采样时刻 (s)，由调度循环填写；压缩等延迟转发的 Reporter 依赖它保留真实时间
+    timestamp: Optional[float] = None
+
     def summary(self) -> str:
         """
         用于调试输出
@@ -0,0 +1,38 @@
+# core/model/static_cache.py
+
+import json
+import os
+from dataclasses import asdict
+
+from core.model.base_xpu import XPUStaticInfo
+
+
+DEFAULT_CACHE_PATH = os.path.join("~", ".cache", "havfs", "static_info.json")
+
+
+def load_static_cache(path=DEFAULT_CACHE_PATH) -> dict:
+    """
+    读取设备静态信息缓存
+    返回 {device_id: XPUStaticInfo}；文件不存在或损坏时返回空字典
+    """
+    path = os.path.expanduser(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        return {e["device_id"]: XPUStaticInfo(**e) for e in entries}
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+
+
+def save_static_cache(infos, path=DEFAULT_CACHE_PATH):
+    """
+    写入设备静态信息缓存（先写临时文件再原子替换，避免并发重启读到半个文件）
+    """
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump([asdict(info) for info in infos], f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
@@ -1,4 +1,21 @@
 # core/reporter/__init__.py
+# 按需导入：未启用 Prometheus 时不加载 prometheus_client
 
-from .console_reporter import ConsoleReporter
-from .prometheus_reporter import PrometheusReporter
+import importlib
+
+_EXPORTS = {
+    "ConsoleReporter": ".console_reporter",
+    "PrometheusReporter": ".prometheus_reporter",
+    "CSVReporter": ".csv_reporter",
+    "RollupReporter": ".rollup_reporter",
+    "SwingingDoorReporter": ".compression_reporter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    return getattr(module, name)
@@ -13,9 +13,20 @@ class BaseReporter(ABC):
     - 支持 Prometheus / HTTP Push / TSDB 写入扩展
     """
 
+    # 下游消费方式：True 表示两点之间保持上一个值 (Prometheus Gauge、分层降采样)，
+    # False 表示按线性插值重建 (CSV 离线分析)；决定可用的压缩方式
+    holds_last_value = False
+
     @abstractmethod
-    def send(self, metrics: XPUDynamicMetrics):
+    def send(self, metrics: XPUDynamicMetrics, risk: float = 0.0, interval: float = 1.0, state: str = None):
         """
         上报一次指标数据
+        risk / interval / state 为调度器输出，不关心的 Reporter 可忽略
+        """
+        pass
+
+    def close(self):
+        """
+        释放资源（文件句柄等），默认无操作
         """
         pass
@@ -0,0 +1,179 @@
+# core/reporter/compression_reporter.py
+
+import logging
+import math
+import time
+
+from core.reporter.base_reporter import BaseReporter
+from core.model.base_xpu import XPUDynamicMetrics
+from core.scheduler.havfs import is_high_state
+
+logger = logging.getLogger(__name__)
+
+
+class _DoorState:
+    """单设备旋转门状态"""
+
+    __slots__ = ("archive_t", "archive_v", "held", "slope_hi", "slope_lo",
+                 "high", "received", "emitted")
+
+    def __init__(self):
+        self.archive_t = None       # 上一个已输出点
+        self.archive_v = None
+        self.held = None            # 最近收到但尚未输出的点 (t, metrics, risk, interval, state)
+        self.slope_hi = math.inf
+        self.slope_lo = -math.inf
+        self.high = False
+        self.received = 0
+        self.emitted = 0
+
+
+class SwingingDoorReporter(BaseReporter):
+    """
+    旋转门 (Swinging Door) / 死区 (Deadband) 压缩上报器
+
+    mode="swinging_door" (默认)，适用于按线性插值重建的下游 (CSV)：
+
+    包装若干下游 Reporter，只转发重建信号所必需的点：
+    - 以上一个输出点为门轴，维护上下两扇“门”的斜率
+    - 门轴→新点的连线落在所有暂存点 ±error_bound 的走廊内，则暂存新点，不输出
+    - 否则输出暂存点，并以其为新门轴
+    - 对输出点做线性插值即可重建原信号，误差不超过 error_bound
+    - 门关闭时输出的是“上一个”采样，下游会滞后一个采样周期；
+      点的时间取 metrics.timestamp，下游据此落盘，不受转发延迟影响
+
+    mode="deadband"，适用于保持上一个值的下游 (Prometheus Gauge、分层降采样)：
+    - 与上一个输出值相差超过 error_bound 时立即输出当前点，否则丢弃
+    - 按阶梯保持重建，误差不超过 error_bound，且没有转发延迟
+
+    两种模式共同的规则：
+    - 与上一个输出点间隔超过 max_gap 时强制输出（心跳）
+    - HIGH/LOW 状态切换时强制输出，保证状态边界可见
+
+    运行期统计：stats() 给出各设备 接收/输出 点数；每隔 log_interval 秒 (采样时间) 输出一行汇总日志，
+    PrometheusReporter.track_compression() 可将其导出为 xpu_compression_*_samples_total{device_id, mode}
+    """
+
+    MODES = ("swinging_door", "deadband")
+
+    def __init__(self, reporters, error_bound=1.0, max_gap=60.0, clock=time.time, mode="swinging_door",
+                 log_interval=300.0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported mode '{mode}'. Choices: {list(self.MODES)}")
+        self.reporters = list(reporters)
+        self.mode = mode
+        self.holds_last_value = mode == "deadband"
+        self.error_bound = error_bound
+        self.max_gap = max_gap
+        self.clock = clock
+        self.log_interval = log_interval
+        self.doors = {}
+        self._next_log = None
+
+    def send(self, metrics: XPUDynamicMetrics, risk: float = 0.0, interval: float = 1.0, state: str = None):
+        door = self.doors.get(metrics.device_id)
+        if door is None:
+            door = self.doors[metrics.device_id] = _DoorState()
+        door.received += 1
+
+        t = metrics.timestamp if metrics.timestamp is not None else self.clock()
+        v = metrics.utilization
+        point = (t, metrics, risk, interval, state)
+        high = is_high_state(state)
+
+        if self.log_interval:
+            if self._next_log is None:
+                self._next_log = t + self.log_interval
+            elif t >= self._next_log:
+                self._next_log = t + self.log_interval
+                self.log_summary()
+
+        # 首个点 / 心跳 / 状态切换：输出暂存点与当前点
+        if door.archive_t is None or t - door.archive_t >= self.max_gap or high != door.high:
+            self._flush_held(door)
+            self._emit(door, point)
+            door.high = high
+            return
+
+        if self.mode == "deadband":
+            if abs(v - door.archive_v) > self.error_bound:
+                self._emit(door, point)
+            return
+
+        dt = t - door.archive_t
+        if dt <= 0:
+            if abs(v - door.archive_v) <= self.error_bound:
+                door.held = point
+                return
+            self._flush_held(door)
+            self._emit(door, point)
+            return
+
+        # 门轴→当前点的连线必须穿过所有被暂存点的 ±error_bound 走廊
+        if not door.slope_lo <= (v - door.archive_v) / dt <= door.slope_hi:
+            # 门被撑开：输出暂存点作为新门轴，当前点重新开门
+            self._flush_held(door)
+            dt = t - door.archive_t
+            if dt <= 0:
+                self._emit(door, point)
+                return
+
+        # 当前点进入暂存，并收窄两扇门
+        E = self.error_bound
+        door.slope_hi = min(door.slope_hi, (v + E - door.archive_v) / dt)
+        door.slope_lo = max(door.slope_lo, (v - E - door.archive_v) / dt)
+        door.held = point
+
+    def _flush_held(self, door):
+        if door.held is not None:
+            self._emit(door, door.held)
+
+    def _emit(self, door, point):
+        t, metrics, risk, interval, state = point
+        for reporter in self.reporters:
+            reporter.send(metrics, risk, interval, state)
+        door.archive_t = t
+        door.archive_v = metrics.utilization
+        door.held = None
+        door.slope_hi = math.inf
+        door.slope_lo = -math.inf
+        door.emitted += 1
+
+    # ------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------
+
+    def compression_ratio(self, device_id) -> float:
+        """接收点数 / 输出点数"""
+        door = self.doors.get(device_id)
+        if door is None or door.emitted == 0:
+            return 1.0
+        return door.received / door.emitted
+
+    def stats(self) -> dict:
+        # 可能在 Prometheus 抓取线程中调用，先复制再遍历
+        return {
+            device_id: {
+                "received": door.received,
+                "emitted": door.emitted,
+                "ratio": self.compression_ratio(device_id),
+            }
+            for device_id, door in list(self.doors.items())
+        }
+
+    def log_summary(self):
+        """全部设备的汇总压缩率"""
+        received = sum(door.received for door in self.doors.values())
+        emitted = sum(door.emitted for door in self.doors.values())
+        logger.info("[Compression/%s] %d devices: %d -> %d points (ratio %.2f)",
+                    self.mode, len(self.doors), received, emitted, received / emitted if emitted else 1.0)
+
+    def close(self):
+        """输出所有暂存点（保证序列末端可重建），再关闭下游"""
+        for door in self.doors.values():
+            self._flush_held(door)
+        for device_id, s in self.stats().items():
+            logger.info("[Compression/%s] %s: %d -> %d points (ratio %.2f)",
+                        self.mode, device_id, s["received"], s["emitted"], s["ratio"])
+        for reporter in self.reporters:
+            reporter.close()
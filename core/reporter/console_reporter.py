@@ -12,5 +12,5 @@ class ConsoleReporter(BaseReporter):
     - 用于验证采集→调度→上报链路完整性
     """
 
-    def send(self, metrics: XPUDynamicMetrics):
+    def send(self, metrics: XPUDynamicMetrics, risk: float = 0.0, interval: float = 1.0, state: str = None):
         print(f"[REPORT] {metrics.device_id}: {metrics.summary()}")
@@ -0,0 +1,49 @@
+# core/reporter/csv_reporter.py
+
+import csv
+import os
+import time
+from datetime import datetime
+
+from core.reporter.base_reporter import BaseReporter
+from core.model.base_xpu import XPUDynamicMetrics
+
+
+class CSVReporter(BaseReporter):
+    """
+    CSV 文件上报器
+
+    - 列格式与 demo/havfs_experiment.py 一致，可直接交给 evaluate_metrics.py 评估
+    - 开销列 (overhead_*) 由实验脚本测量，此处留空
+    - time 为相对本次运行开始的秒数；epoch 为采样时刻 (epoch s)，供 RollupStore.ingest_csv 导入
+    """
+
+    HEADER = [
+        "timestamp", "time", "device_id", "utilization", "risk_score", "interval", "state",
+        "overhead_cpu", "overhead_mem_mb", "epoch"
+    ]
+
+    def __init__(self, path="experiments/agent.csv"):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.HEADER)
+        self._start = None
+
+    def send(self, metrics: XPUDynamicMetrics, risk: float = 0.0, interval: float = 1.0, state: str = None):
+        # 优先使用采样时刻，压缩后延迟转发的点也能落在正确的时间上
+        t = metrics.timestamp if metrics.timestamp is not None else time.time()
+        if self._start is None:
+            self._start = t
+        self._writer.writerow([
+            datetime.fromtimestamp(t).strftime("%H:%M:%S.%f")[:-3],
+            round(t - self._start, 3),
+            metrics.device_id, metrics.utilization, risk, interval, state,
+            "", "", round(t, 3)
+        ])
+
+    def close(self):
+        self._file.close()
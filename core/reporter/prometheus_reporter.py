@@ -1,7 +1,28 @@
 # core/reporter/prometheus_reporter.py
-from prometheus_client import start_http_server, Gauge
+import time
+from prometheus_client import start_http_server, Counter, Gauge, REGISTRY
+from prometheus_client.core import CounterMetricFamily
 from core.reporter.base_reporter import BaseReporter
 from core.model.base_xpu import XPUDynamicMetrics
+from core.scheduler.havfs import is_high_state
+
+class _CompressionCollector:
+    """按抓取读取各压缩器的 stats()"""
+
+    def __init__(self, compressors):
+        self.compressors = compressors
+
+    def collect(self):
+        labels = ['device_id', 'mode']
+        received = CounterMetricFamily('xpu_compression_received_samples', 'Samples Received by Compression', labels=labels)
+        emitted = CounterMetricFamily('xpu_compression_emitted_samples', 'Samples Forwarded after Compression', labels=labels)
+        for compressor in self.compressors:
+            for device_id, s in compressor.stats().items():
+                received.add_metric([device_id, compressor.mode], s["received"])
+                emitted.add_metric([device_id, compressor.mode], s["emitted"])
+        yield received
+        yield emitted
+
 
 class PrometheusReporter(BaseReporter):
     """
@@ -9,12 +30,22 @@ class PrometheusReporter(BaseReporter):
     功能：
     - 启动 HTTP Server (默认端口 8000)
     - 将 XPUDynamicMetrics 映射为 Prometheus Gauge 指标
+    - 设备生命周期管理：超过 stale_after 秒未上报的设备移除其全部子序列
+    - 设备数上限 max_devices：超出后新设备的样本被丢弃并计数
+    - exemplars=True 时把 HAVFS 状态与风险作为 exemplar 挂在样本计数器上，
+      不增加标签维度 (需以 OpenMetrics 格式抓取)
     """
 
-    def __init__(self, port=8000):
+    holds_last_value = True
+
+    def __init__(self, port=8000, stale_after=300.0, max_devices=None, exemplars=False, clock=time.time):
         self.port = port
+        self.stale_after = stale_after
+        self.max_devices = max_devices
+        self.exemplars = exemplars
+        self.clock = clock
         print(f"[Prometheus] Starting exporter on port {port}...")
-        
+
         # 启动后台 HTTP 服务，供 Prometheus Server 拉取
         # 注意：在多进程环境下需小心，但在毕设单脚本实验中没问题
         try:
@@ -25,34 +56,93 @@ class PrometheusReporter(BaseReporter):
         # --- 定义指标 (Gauge) ---
         # 标签 (Labels): device_id, device_type
         labels = ['device_id']
-        
+
         self.g_util = Gauge('xpu_utilization_percent', 'Device Utilization', labels)
         self.g_temp = Gauge('xpu_temperature_celsius', 'Device Temperature', labels)
         self.g_power = Gauge('xpu_power_watts', 'Device Power Consumption', labels)
         self.g_mem  = Gauge('xpu_memory_usage_percent', 'Memory Usage', labels)
         self.g_risk = Gauge('xpu_risk_score', 'Calculated Risk Score', labels)
         self.g_int  = Gauge('xpu_sampling_interval_seconds', 'Current Sampling Interval', labels)
+        self.per_device = [self.g_util, self.g_temp, self.g_power, self.g_mem, self.g_risk, self.g_int]
+
+        # 样本计数器仅用于承载 exemplar，未启用时不创建，避免多出一组子序列
+        self.c_samples = None
+        if exemplars:
+            self.c_samples = Counter('xpu_samples', 'Reported Samples (HAVFS state/risk as exemplars)', labels)
+            self.per_device.append(self.c_samples)
+
+        # --- Exporter 自身状态 ---
+        self.g_devices = Gauge('xpu_exporter_devices', 'Devices Currently Exported')
+        self.c_dropped = Counter('xpu_exporter_dropped_samples', 'Samples Dropped by max_devices Cap')
+        self.c_evicted = Counter('xpu_exporter_evicted_devices', 'Devices Removed after Going Stale')
 
-    def send(self, metrics: XPUDynamicMetrics, risk: float = 0.0, interval: float = 1.0):
+        # device_id -> 最近一次上报时间
+        self.last_seen = {}
+        self._next_prune = self.clock() + self.stale_after
+
+    def send(self, metrics: XPUDynamicMetrics, risk: float = 0.0, interval: float = 1.0, state: str = None):
         """
         更新指标数值
         注意：send 方法签名增加了 risk 和 interval 参数，以便上报调度状态
         """
+        now = self.clock()
+        if now >= self._next_prune:
+            self.prune(now)
+
+        device_id = metrics.device_id
+        if device_id not in self.last_seen:
+            if self.max_devices is not None and len(self.last_seen) >= self.max_devices:
+                self.c_dropped.inc()
+                return
+            self.g_devices.inc()
+        self.last_seen[device_id] = now
+
         # 提取标签值
-        lbl = [metrics.device_id]
+        lbl = [device_id]
 
         # 更新 Gauges
         self.g_util.labels(*lbl).set(metrics.utilization)
-        
+
         if metrics.temperature is not None:
             self.g_temp.labels(*lbl).set(metrics.temperature)
-            
+
         if metrics.power is not None:
             self.g_power.labels(*lbl).set(metrics.power)
-            
+
         if metrics.memory_usage is not None:
             self.g_mem.labels(*lbl).set(metrics.memory_usage)
 
         # 上报算法状态（这对可视化非常有价值）
         self.g_risk.labels(*lbl).set(risk)
-        self.g_int.labels(*lbl).set(interval)
\ No newline at end of file
+        self.g_int.labels(*lbl).set(interval)
+
+        if self.c_samples is not None:
+            self.c_samples.labels(*lbl).inc(exemplar={
+                'state': 'HIGH' if is_high_state(state) else 'LOW',
+                'risk': f"{risk:.1f}",
+            })
+
+    def track_compression(self, compressors):
+        """
+        导出 SwingingDoorReporter 的运行期统计（抓取时读取，不占用采样链路）：
+        xpu_compression_received_samples_total / xpu_compression_emitted_samples_total {device_id, mode}
+        """
+        REGISTRY.register(_CompressionCollector(list(compressors)))
+
+    def prune(self, now=None):
+        """移除超过 stale_after 秒未上报设备的全部子序列"""
+        now = self.clock() if now is None else now
+        self._next_prune = now + min(self.stale_after, 60.0)
+
+        stale = [d for d, seen in self.last_seen.items() if now - seen > self.stale_after]
+        for device_id in stale:
+            del self.last_seen[device_id]
+            for metric in self.per_device:
+                try:
+                    metric.remove(device_id)
+                except KeyError:
+                    # 该设备从未上报过此项 (如温度为 None)
+                    pass
+            self.g_devices.dec()
+            self.c_evicted.inc()
+        return stale
@@ -0,0 +1,31 @@
+# core/reporter/rollup_reporter.py
+
+import time
+
+from core.reporter.base_reporter import BaseReporter
+from core.model.base_xpu import XPUDynamicMetrics
+from core.scheduler.havfs import is_high_state
+from core.storage.rollup import RollupStore
+
+
+class RollupReporter(BaseReporter):
+    """
+    分层降采样上报器
+    将采样流写入 RollupStore (10s / 1m / 1h)，供长期保存与区间查询
+
+    path: 持久化目录（见 RollupStore），为空则只保存在内存中
+    clock: 返回当前时间 (s) 的函数，压测时可传入 VirtualClock.now
+    """
+
+    holds_last_value = True
+
+    def __init__(self, path="experiments/rollup", store=None, clock=time.time):
+        self.store = store or RollupStore(path=path)
+        self.clock = clock
+
+    def send(self, metrics: XPUDynamicMetrics, risk: float = 0.0, interval: float = 1.0, state: str = None):
+        t = metrics.timestamp if metrics.timestamp is not None else self.clock()
+        self.store.add(metrics.device_id, t, metrics.utilization, is_high_state(state))
+
+    def close(self):
+        self.store.close()
@@ -0,0 +1,219 @@
+# core/scheduler/burst.py
+
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BurstCapture:
+    """
+    一次突发捕获的结果（附加到 RiskBuffer.captures）
+    """
+    device_id: str
+    start_time: float          # 起始时刻（Agent 时钟，墙钟下为 epoch s）
+    rate_hz: float
+    offsets: np.ndarray        # 相对 start_time 的采样时刻 (s)
+    values: np.ndarray         # 利用率 (%)
+    path: Optional[str] = None # 批量写出的文件
+
+
+class _Slot:
+    """一个捕获槽位：预分配数组 + 当前捕获进度"""
+
+    def __init__(self, n):
+        self.offsets = np.empty(n)
+        self.values = np.empty(n)
+        self.sampler = None
+        self.start = 0.0
+        self.i = 0      # 已到期的采样次数
+        self.n = 0      # 有效样本数
+
+
+class BurstPool:
+    """
+    突发捕获线程池（所有设备共享一个采样线程）
+
+    HAVFS 从 LOW 进入 HIGH 时，对应设备的 BurstSampler 向池申请一个槽位；
+    采样线程按各捕获的绝对截止时刻轮流以 rate_hz (10~100 Hz) 只读取廉价的利用率信号，
+    写入槽位的预分配数组，持续 window 秒后一次性写出 CSV，并通过 on_capture 回调附加到事件上。
+    高频数据不经过 采集→调度→上报 主链路。
+
+    - 最多 max_active 个设备同时捕获，槽位用尽时新的捕获请求被跳过并计入 skipped；
+      设备再多也只有一个线程、max_active 份数组
+    - 计时使用 Agent 的时钟 (clock.now / clock.sleep)，与主循环的时间轴一致；
+      纯虚拟时钟 (speedup=None) 下 sleep 不占用真实时间，无法做高频采样，直接拒绝
+    - 采样线程常驻复用：psutil.cpu_percent(interval=None) 的基线按线程记录，
+      每次捕获前先读一次建立基线，首个样本不会是 0
+    """
+
+    MIN_RATE_HZ = 10.0
+    MAX_RATE_HZ = 100.0
+
+    def __init__(self, rate_hz=50.0, window=5.0, output_dir="experiments/bursts", max_active=4, clock=None):
+        if not self.MIN_RATE_HZ <= rate_hz <= self.MAX_RATE_HZ:
+            raise ValueError(f"rate_hz must be within [{self.MIN_RATE_HZ:g}, {self.MAX_RATE_HZ:g}] Hz, got {rate_hz}")
+        if clock is not None and getattr(clock, "speedup", 1.0) is None:
+            raise ValueError("BurstPool requires a clock that runs in real time (speedup=None is not supported)")
+        self.rate_hz = rate_hz
+        self.window = window
+        self.output_dir = output_dir
+        self.max_active = max_active
+        self.skipped = 0
+        self._now = clock.now if clock is not None else time.time
+        self._sleep = clock.sleep if clock is not None else time.sleep
+
+        # 预分配：捕获期间不再申请内存
+        n = max(int(rate_hz * window), 1)
+        self._free = [_Slot(n) for _ in range(max_active)]
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="burst", daemon=True)
+        self._thread.start()
+
+    def request(self, sampler):
+        """申请一次捕获；无空闲槽位时返回 False"""
+        with self._lock:
+            if not self._free:
+                self.skipped += 1
+                logger.debug("[Burst] All %d slots busy, skipped capture for %s",
+                             self.max_active, sampler.device_id)
+                return False
+            slot = self._free.pop()
+            slot.sampler = sampler
+            sampler.running = True
+            self._pending.append(slot)
+        self._wake.set()
+        return True
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        now, sleep = self._now, self._sleep
+        # (下一次采样截止时刻, 序号, 槽位)
+        heap = []
+        seq = 0
+
+        while not self._stop.is_set():
+            with self._lock:
+                pending, self._pending = self._pending, []
+            for slot in pending:
+                # 建立本线程的 cpu_percent 基线，结果丢弃；第一个样本在一个周期后读取
+                self._sample(slot)
+                slot.start, slot.i, slot.n = now(), 0, 0
+                seq += 1
+                heapq.heappush(heap, (slot.start + period, seq, slot))
+
+            if not heap:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            # 有捕获进行时最多等待一个周期，新请求的延迟不超过一个周期
+            deadline, _, slot = heap[0]
+            delay = deadline - now()
+            if delay > 0:
+                sleep(delay)
+            heapq.heappop(heap)
+
+            value = self._sample(slot)
+            # 采集器无数据时返回 NaN（如 npu-smi 数据过期），跳过该样本
+            if value == value:
+                slot.offsets[slot.n] = now() - slot.start
+                slot.values[slot.n] = value
+                slot.n += 1
+            slot.i += 1
+
+            if slot.i < len(slot.values):
+                # 按绝对截止时刻排期，避免累计漂移
+                seq += 1
+                heapq.heappush(heap, (slot.start + (slot.i + 1) * period, seq, slot))
+            else:
+                self._finish(slot)
+
+        # 停止时输出已采到的部分
+        for _, _, slot in heap:
+            self._finish(slot)
+
+    def _sample(self, slot):
+        try:
+            return slot.sampler.collector.sample_utilization()
+        except Exception as e:
+            logger.debug("[Burst] Sample failed for %s: %s", slot.sampler.device_id, e)
+            return math.nan
+
+    def _finish(self, slot):
+        sampler = slot.sampler
+        try:
+            if slot.n == 0:
+                logger.warning("[Burst] No data for %s during capture, discarded", sampler.device_id)
+                return
+            capture = BurstCapture(
+                device_id=sampler.device_id,
+                start_time=slot.start,
+                rate_hz=self.rate_hz,
+                offsets=slot.offsets[:slot.n].copy(),
+                values=slot.values[:slot.n].copy()
+            )
+            try:
+                capture.path = self._write(capture)
+            except OSError as e:
+                logger.warning("[Burst] Failed to write capture for %s: %s", sampler.device_id, e)
+            if sampler.on_capture is not None:
+                sampler.on_capture(capture)
+        finally:
+            with self._lock:
+                slot.sampler = None
+                sampler.running = False
+                self._free.append(slot)
+
+    def _write(self, capture):
+        """整窗一次性写出"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.fromtimestamp(capture.start_time).strftime("%Y%m%d-%H%M%S.%f")[:-3]
+        path = os.path.join(self.output_dir, f"burst_{capture.device_id}_{stamp}.csv")
+        np.savetxt(
+            path,
+            np.column_stack((capture.offsets, capture.values)),
+            delimiter=",", fmt=("%.4f", "%.2f"),
+            header="offset_s,utilization", comments=""
+        )
+        return path
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+
+
+class BurstSampler:
+    """
+    单设备的突发捕获触发器（不持有线程与数组）
+    每次 HAVFS.update() 之后调用 observe()，进入 HIGH 时向共享的 BurstPool 申请捕获
+    """
+
+    def __init__(self, collector, device_id, pool, on_capture=None):
+        self.collector = collector
+        self.device_id = device_id
+        self.pool = pool
+        self.on_capture = on_capture
+        self.running = False
+        self._last_state = "LOW"
+
+    def observe(self, state):
+        """传入 HAVFS.state ("LOW"/"HIGH")"""
+        entered_high = self._last_state != "HIGH" and state == "HIGH"
+        self._last_state = state
+        if entered_high and not self.running:
+            self.pool.request(self)
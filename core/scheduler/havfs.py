@@ -1,9 +1,19 @@
 # core/scheduler/havfs.py
 
 import math
+import threading
 from collections import deque
 from dataclasses import dataclass
 
+# HIGH 状态对应的中文标签前缀 (见 HAVFS.update 的 state_label)
+HIGH_LABEL_PREFIX = "高频"
+
+
+def is_high_state(state_label) -> bool:
+    """根据 update() 返回的状态标签判断是否处于 HIGH 状态"""
+    return bool(state_label) and state_label.startswith(HIGH_LABEL_PREFIX)
+
+
 # ==========================================================
 # Step 1: 在线基线化与趋势预测 (Holt Linear)
 # ==========================================================
@@ -58,16 +68,60 @@ class RiskBuffer:
     """
     探索与缓冲模块:
     在 HIGH 风险阶段保存关键窗口数据, 用于后续离线分析或模型微调
+
+    - 最近 maxlen 条 (risk_score, metrics) 存于预分配的环形槽位；
+      store() 只做槽位赋值与计数，不申请新容器、不读时钟（时间取 metrics.timestamp）
+    - seq 为累计写入条数；读取不消费数据，读取方各自持有游标，用 read(since) 增量读取
+    - captures 保存突发捕获 (BurstCapture) 得到的高频窗口，capture_seq 为累计附加次数
     """
 
-    def __init__(self, maxlen=20):
-        self.buffer = deque(maxlen=maxlen)
+    def __init__(self, maxlen=20, max_captures=10):
+        self.maxlen = maxlen
+        self._risk = [None] * maxlen
+        self._metrics = [None] * maxlen
+        self.seq = 0
 
-    def store(self, metrics):
-        self.buffer.append(metrics)
+        self.captures = deque(maxlen=max_captures)
+        self.capture_seq = 0
+        self._capture_lock = threading.Lock()
+
+    def store(self, metrics, risk=None):
+        i = self.seq % self.maxlen
+        self._risk[i] = risk
+        self._metrics[i] = metrics
+        self.seq += 1
+
+    def read(self, since=0):
+        """
+        返回 (next_seq, [(risk_score, metrics), ...], lost)：游标 since 之后仍在缓冲区中的条目（时间顺序）
+        lost 为读取前已被覆盖（或读取期间可能被覆盖而丢弃）的条目数
+        可在采样线程写入的同时调用
+        """
+        end = self.seq
+        start = max(since, end - self.maxlen)
+        entries = [
+            (self._risk[s % self.maxlen], self._metrics[s % self.maxlen])
+            for s in range(start, end)
+        ]
+        # 写入方可能已推进并覆盖最旧的槽位（再留一个正在写的槽位）
+        overwritten = self.seq + 1 - self.maxlen
+        if overwritten > start:
+            entries = entries[overwritten - start:]
+        return end, entries, end - since - len(entries)
+
+    def attach(self, capture):
+        with self._capture_lock:
+            self.captures.append(capture)
+            self.capture_seq += 1
+
+    def read_captures(self, since=0):
+        """返回 (next_capture_seq, [BurstCapture, ...])：游标 since 之后附加且仍保留的捕获"""
+        with self._capture_lock:
+            new = min(self.capture_seq - since, len(self.captures))
+            return self.capture_seq, list(self.captures)[len(self.captures) - new:]
 
     def size(self):
-        return len(self.buffer)
+        return min(self.seq, self.maxlen)
 
 
 # ==========================================================
@@ -242,7 +296,7 @@ class HAVFS:
 
         # Step 5: 高风险缓冲
         if raw_state == "HIGH":
-            self.buffer.store(metrics)
+            self.buffer.store(metrics, R * 100.0)
 
         # 生成用于显示的中文状态标签
         if raw_state == "HIGH":
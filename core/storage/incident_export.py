@@ -0,0 +1,309 @@
+# core/storage/incident_export.py
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# pyarrow 为可选依赖，仅导出/加载事件数据时需要
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+logger = logging.getLogger(__name__)
+
+# 两个数据集：HIGH 窗口的逐次采样 / 突发捕获的高频利用率
+KINDS = ("windows", "bursts")
+
+
+def _schema(kind):
+    if kind == "bursts":
+        return pa.schema([
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("capture_start", pa.timestamp("us", tz="UTC")),
+            ("rate_hz", pa.float64()),
+            ("utilization", pa.float64()),
+        ])
+    return pa.schema([
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("risk_score", pa.float64()),
+        ("utilization", pa.float64()),
+        ("temperature", pa.float64()),
+        ("power", pa.float64()),
+        ("memory_usage", pa.float64()),
+        ("bandwidth", pa.float64()),
+    ])
+
+
+def _record_batch(kind, columns):
+    schema = _schema(kind)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in schema],
+        schema=schema
+    )
+
+
+def _day(t):
+    return datetime.fromtimestamp(t, timezone.utc).strftime("%Y-%m-%d")
+
+
+class _PartWriter:
+    """
+    一个 (device_id, date) 分区的当前文件
+
+    文件在写入期间以隐藏名 (.part-*.tmp) 存在，数据集扫描会忽略它；
+    close() 写出剩余行、补全文件尾后改名为正式文件
+    row_groups / opened 供导出器判断何时封闭（文件小而及时，进程被强杀最多丢失一个分片）
+    """
+
+    def __init__(self, directory, name, schema, format, compression):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, name)
+        self.tmp = os.path.join(directory, f".{name}.tmp")
+        self.pending = []
+        self.pending_rows = 0
+        self.row_groups = 0
+        self.opened = time.monotonic()
+        if format == "parquet":
+            self._writer = pq.ParquetWriter(self.tmp, schema, compression=compression)
+            self._sink = None
+        else:
+            self._sink = pa.OSFile(self.tmp, "wb")
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            self._writer = pa.ipc.new_file(self._sink, schema, options=options)
+
+    def append(self, batch, row_group_size):
+        """累积到 row_group_size 行再写出一个 row group / record batch，避免碎小的行组"""
+        self.pending.append(batch)
+        self.pending_rows += batch.num_rows
+        if self.pending_rows >= row_group_size:
+            self._write_pending()
+
+    def _write_pending(self):
+        if self.pending:
+            self._writer.write_table(pa.Table.from_batches(self.pending).combine_chunks())
+            self.pending = []
+            self.pending_rows = 0
+            self.row_groups += 1
+
+    def close(self):
+        self._write_pending()
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        os.replace(self.tmp, self.path)
+        return self.path
+
+
+class IncidentExporter:
+    """
+    高风险窗口批量导出器 (RiskBuffer -> Parquet / Arrow)
+
+    - 后台线程按游标增量读取各设备 RiskBuffer 中的 HIGH 窗口与突发捕获，
+      不消费缓冲区，采样主链路不做任何额外工作
+    - 按列组织并压缩，只追加，不改写已完成的文件
+    - 两个数据集，各自按 device_id / date 分区 (hive 风格)，可直接用 load_incidents() 读取:
+        root/windows/device_id=gpu0/date=2026-10-19/part-<ms>-<seq>.parquet
+        root/bursts/device_id=gpu0/date=2026-10-19/part-<ms>-<seq>.parquet
+    - 每个 (数据集, device_id, date) 只保持一个打开的文件，凑满 row_group_size 行写一个行组；
+      写满 max_row_groups 个行组、打开超过 max_age 秒、该设备出现更晚日期的数据
+      或 close() 时封闭文件。写入中的文件对读取方不可见，进程被强杀最多丢失一个分片
+    - 启动时处理上次遗留的隐藏临时文件：完整的改名入库，不完整的删除
+    - 缓冲区在两次 flush 之间被写满、条目被覆盖时记录警告
+
+    注意：RiskBuffer 有长度上限，flush_interval 需小于缓冲区被写满所需时间
+    (默认 50 条 × t_min 0.5s = 25s)
+    """
+
+    def __init__(self, root="experiments/incidents", flush_interval=10.0, format="parquet", compression="zstd",
+                 row_group_size=256, max_row_groups=4, max_age=300.0):
+        if not HAS_ARROW:
+            raise ImportError("IncidentExporter requires 'pyarrow' (pip install pyarrow)")
+        if format not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported format '{format}'. Choices: ['arrow', 'parquet']")
+
+        self.root = root
+        self.flush_interval = flush_interval
+        self.format = format
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.max_row_groups = max_row_groups
+        self.max_age = max_age
+        self.buffers = {}
+        # device_id -> [窗口游标 seq, 捕获游标 capture_seq]
+        self.cursors = {}
+        # (kind, device_id, date) -> _PartWriter
+        self.writers = {}
+        self.rows_written = 0
+
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.recover()
+
+    def recover(self):
+        """
+        处理进程异常退出遗留的 .part-*.tmp：能完整读出的改名为正式文件，
+        否则（缺少文件尾）删除；返回 (恢复数, 删除数)
+        """
+        recovered = removed = 0
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if not (name.startswith(".") and name.endswith(".tmp")):
+                    continue
+                tmp = os.path.join(directory, name)
+                try:
+                    if name.endswith(".parquet.tmp"):
+                        pq.ParquetFile(tmp).metadata
+                    else:
+                        pa.ipc.open_file(tmp).schema
+                except Exception:
+                    os.remove(tmp)
+                    removed += 1
+                    continue
+                os.replace(tmp, os.path.join(directory, name[1:-len(".tmp")]))
+                recovered += 1
+        if recovered or removed:
+            logger.warning("[Export] Leftover part files: %d recovered, %d incomplete removed",
+                           recovered, removed)
+        return recovered, removed
+
+    def register(self, device_id, risk_buffer):
+        self.buffers[device_id] = risk_buffer
+        self.cursors[device_id] = [0, 0]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="incident-export", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning("[Export] Incident flush failed: %s", e)
+
+    # ------------------------------------------------------
+
+    def flush(self):
+        """
+        读取各缓冲区自上次以来的新条目，追加到对应分区的打开文件；
+        随后封闭已写满、过旧或日期已过去的文件，返回本次封闭的文件路径
+        """
+        for device_id, risk_buffer in list(self.buffers.items()):
+            cursor = self.cursors[device_id]
+            cursor[0], entries, lost = risk_buffer.read(cursor[0])
+            if lost:
+                logger.warning("[Export] %s: %d buffered entries overwritten before flush "
+                               "(lower flush_interval or enlarge RiskBuffer)", device_id, lost)
+            cursor[1], captures = risk_buffer.read_captures(cursor[1])
+
+            if entries:
+                # 未填写采样时刻的条目以导出时刻代替
+                now = time.time()
+                rows = [
+                    (m.timestamp if m.timestamp is not None else now, risk, m)
+                    for risk, m in entries
+                ]
+                self._append("windows", device_id, rows, self._window_batch)
+            for capture in captures:
+                rows = [
+                    (capture.start_time + offset, capture, value)
+                    for offset, value in zip(capture.offsets.tolist(), capture.values.tolist())
+                ]
+                self._append("bursts", device_id, rows, self._burst_batch)
+
+        # 日期切换：早于该设备最新日期的文件不会再有数据
+        latest = {}
+        for kind, device_id, day in self.writers:
+            latest[kind, device_id] = max(day, latest.get((kind, device_id), day))
+        opened_before = time.monotonic() - self.max_age
+        return self._close_writers(
+            key for key, writer in self.writers.items()
+            if key[2] < latest[key[:2]]
+            or writer.row_groups >= self.max_row_groups
+            or writer.opened < opened_before
+        )
+
+    def _append(self, kind, device_id, rows, to_batch):
+        """rows 的首个元素为 epoch 秒；按 UTC 日期分组写入"""
+        groups = {}
+        for row in rows:
+            groups.setdefault(_day(row[0]), []).append(row)
+        for day, day_rows in groups.items():
+            self._writer(kind, device_id, day).append(to_batch(day_rows), self.row_group_size)
+            self.rows_written += len(day_rows)
+
+    def _writer(self, kind, device_id, day):
+        writer = self.writers.get((kind, device_id, day))
+        if writer is None:
+            directory = os.path.join(self.root, kind, f"device_id={device_id}", f"date={day}")
+            self._seq += 1
+            suffix = "parquet" if self.format == "parquet" else "arrow"
+            name = f"part-{int(time.time() * 1000)}-{self._seq:06d}.{suffix}"
+            writer = self.writers[(kind, device_id, day)] = _PartWriter(
+                directory, name, _schema(kind), self.format, self.compression
+            )
+        return writer
+
+    def _close_writers(self, keys):
+        paths = []
+        for key in list(keys):
+            paths.append(self.writers.pop(key).close())
+        return paths
+
+    @staticmethod
+    def _window_batch(rows):
+        return _record_batch("windows", {
+            "timestamp": [int(t * 1_000_000) for t, _, _ in rows],
+            "risk_score": [r for _, r, _ in rows],
+            "utilization": [m.utilization for _, _, m in rows],
+            "temperature": [m.temperature for _, _, m in rows],
+            "power": [m.power for _, _, m in rows],
+            "memory_usage": [m.memory_usage for _, _, m in rows],
+            "bandwidth": [m.bandwidth for _, _, m in rows],
+        })
+
+    @staticmethod
+    def _burst_batch(rows):
+        return _record_batch("bursts", {
+            "timestamp": [int(t * 1_000_000) for t, _, _ in rows],
+            "capture_start": [int(c.start_time * 1_000_000) for _, c, _ in rows],
+            "rate_hz": [float(c.rate_hz) for _, c, _ in rows],
+            "utilization": [v for _, _, v in rows],
+        })
+
+    def close(self):
+        """停止后台线程，写出剩余数据并封闭全部文件；返回封闭的文件路径"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.flush() + self._close_writers(self.writers)
+
+
+def load_incidents(root="experiments/incidents", format="parquet", device_id=None, kind="windows"):
+    """
+    读取导出的事件数据集，返回 pyarrow.Table（含分区列 device_id / date）
+    kind: "windows" (HIGH 窗口采样) 或 "bursts" (突发捕获高频利用率)
+    需要 pandas 时调用 .to_pandas()
+    """
+    if not HAS_ARROW:
+        raise ImportError("load_incidents requires 'pyarrow' (pip install pyarrow)")
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind '{kind}'. Choices: {list(KINDS)}")
+    dataset = ds.dataset(
+        os.path.join(root, kind),
+        format="ipc" if format == "arrow" else "parquet",
+        partitioning=ds.partitioning(
+            pa.schema([("device_id", pa.string()), ("date", pa.string())]), flavor="hive"
+        )
+    )
+    if device_id is None:
+        return dataset.to_table()
+    return dataset.to_table(filter=ds.field("device_id") == device_id)
@@ -0,0 +1,367 @@
+# core/storage/rollup.py
+
+import csv
+import functools
+import json
+import math
+import os
+from collections import deque
+from dataclasses import asdict, dataclass, replace
+
+from core.scheduler.havfs import is_high_state
+
+
+# 默认分层：(分辨率 s, 保留桶数) —— 10s 保留 1 天, 1m 保留 1 周, 1h 保留 1 年
+DEFAULT_TIERS = ((10.0, 8640), (60.0, 10080), (3600.0, 8760))
+
+
+# ==========================================================
+# 聚合桶
+# ==========================================================
+
+@dataclass
+class RollupBucket:
+    """
+    一个时间桶的聚合结果
+
+    HAVFS 采样间隔不等长，因此均值按时间加权：
+    每个采样值保持到下一个采样到来为止（阶梯插值）
+    min/max 保留桶内出现过的极值，短时尖峰不会被均值抹平
+    """
+    start: float
+    resolution: float
+    duration: float = 0.0        # 桶内有数据覆盖的时长
+    weighted_sum: float = 0.0    # ∑ value * dt
+    high_time: float = 0.0       # 处于 HIGH 状态的时长
+    min: float = math.inf
+    max: float = -math.inf
+    last: float = math.nan
+    count: int = 0               # 落在桶内的原始采样点数
+
+    @property
+    def mean(self) -> float:
+        if self.duration > 0:
+            return self.weighted_sum / self.duration
+        return self.last
+
+    @property
+    def high_fraction(self) -> float:
+        if self.duration > 0:
+            return self.high_time / self.duration
+        return 0.0
+
+    def add_point(self, value):
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.last = value
+        self.count += 1
+
+    def add_span(self, value, dt, high):
+        self.duration += dt
+        self.weighted_sum += value * dt
+        if high:
+            self.high_time += dt
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        """合并更细粒度的桶（other 的时间必须在 self 之后或相同）"""
+        self.duration += other.duration
+        self.weighted_sum += other.weighted_sum
+        self.high_time += other.high_time
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if not math.isnan(other.last):
+            self.last = other.last
+        self.count += other.count
+
+
+# ==========================================================
+# 单层
+# ==========================================================
+
+class RollupTier:
+    """
+    固定分辨率的一层：已封闭的桶 (deque, 有上限) + 当前开放桶
+    on_close: 桶封闭时的回调（用于持久化）
+    """
+
+    def __init__(self, resolution, retention, on_close=None):
+        self.resolution = resolution
+        self.closed = deque(maxlen=retention)
+        self.open = None
+        self.on_close = on_close
+
+    def bucket_start(self, t):
+        return math.floor(t / self.resolution) * self.resolution
+
+    def roll_to(self, start):
+        """
+        将开放桶切换到 start；返回被封闭的旧桶（无则 None）
+        """
+        if self.open is not None and self.open.start == start:
+            return None
+        finished = self.open
+        if finished is not None:
+            self.close_bucket(finished)
+        self.open = RollupBucket(start=start, resolution=self.resolution)
+        return finished
+
+    def close_bucket(self, bucket):
+        self.closed.append(bucket)
+        if self.on_close is not None:
+            self.on_close(bucket)
+
+    def evicted(self):
+        """是否已因保留上限丢弃过旧桶"""
+        return len(self.closed) == self.closed.maxlen
+
+    def oldest(self):
+        if self.closed:
+            return self.closed[0].start
+        return self.open.start if self.open is not None else math.inf
+
+
+# ==========================================================
+# 单设备多层序列
+# ==========================================================
+
+class RollupSeries:
+    """
+    增量分层降采样
+
+    - 原始采样只写入最细一层
+    - 细层桶封闭时合并进上一层（级联），粗层无需重扫原始数据
+    - 超过 max_hold 秒的采样空档视为缺数，不做外推
+    - on_close(level, bucket) 在任一层封闭桶时被调用
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, max_hold=60.0, on_close=None):
+        self.tiers = [
+            RollupTier(res, keep, functools.partial(on_close, level) if on_close else None)
+            for level, (res, keep) in enumerate(tiers)
+        ]
+        self.max_hold = max_hold
+        self.last_t = None
+        self.last_value = None
+        self.last_high = False
+
+    def add(self, t, value, high=False):
+        """追加一个采样点；乱序（早于上一个点）的采样直接丢弃"""
+        if self.last_t is not None:
+            if t < self.last_t:
+                return
+            span_end = min(t, self.last_t + self.max_hold)
+            self._add_span(self.last_t, span_end, self.last_value, self.last_high)
+
+        self._bucket_at(t).add_point(value)
+        self.last_t, self.last_value, self.last_high = t, value, high
+
+    def _bucket_at(self, t):
+        """取最细层中 t 所在的桶，必要时封闭旧桶并向上级联"""
+        fine = self.tiers[0]
+        finished = fine.roll_to(fine.bucket_start(t))
+        if finished is not None:
+            self._cascade(1, finished)
+        return fine.open
+
+    def _cascade(self, level, bucket):
+        if level >= len(self.tiers):
+            return
+        tier = self.tiers[level]
+        finished = tier.roll_to(tier.bucket_start(bucket.start))
+        if finished is not None:
+            self._cascade(level + 1, finished)
+        tier.open.merge(bucket)
+
+    def _add_span(self, t0, t1, value, high):
+        """把 [t0, t1) 区间的保持值按桶边界切分写入最细层"""
+        res = self.tiers[0].resolution
+        while t0 < t1:
+            edge = min(t1, self.tiers[0].bucket_start(t0) + res)
+            self._bucket_at(t0).add_span(value, edge - t0, high)
+            t0 = edge
+
+    def close(self):
+        """
+        由细到粗封闭全部开放桶（细层的部分桶先级联进粗层），用于进程退出前持久化
+        重启后同一时间段的新数据会形成同 start 的桶，查询/加载时按 start 合并
+        """
+        for level, tier in enumerate(self.tiers):
+            bucket = tier.open
+            if bucket is None:
+                continue
+            tier.open = None
+            tier.close_bucket(bucket)
+            self._cascade(level + 1, bucket)
+
+    # ------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------
+
+    def choose_tier(self, start, step):
+        """
+        选取 “足够细” 的最粗层：分辨率 <= step
+        仅当该层已因保留上限丢弃过旧桶、且覆盖不到 start 时，才向更粗层退让
+        （start 早于首个采样不算“覆盖不到”）
+        """
+        chosen = 0
+        for i, tier in enumerate(self.tiers):
+            if tier.resolution <= step:
+                chosen = i
+        while chosen < len(self.tiers) - 1:
+            tier = self.tiers[chosen]
+            if not (tier.evicted() and tier.oldest() > start):
+                break
+            chosen += 1
+        return chosen
+
+    def query(self, start, end, step=None, max_points=300):
+        """
+        返回 [start, end) 内的桶列表（副本）
+        step 缺省时按 max_points 推算所需分辨率
+        """
+        if step is None:
+            step = (end - start) / max_points
+        level = self.choose_tier(start, step)
+        tier = self.tiers[level]
+
+        result = [replace(b) for b in tier.closed if start <= b.start + b.resolution and b.start < end]
+
+        # 开放桶：叠加尚未级联上来的更细层开放桶，得到截至当前的完整值
+        if tier.open is not None and tier.open.start < end and start <= tier.open.start + tier.resolution:
+            current = replace(tier.open)
+            self._fold_pending(level, current)
+            result.append(current)
+        return merge_same_start(result)
+
+    def _fold_pending(self, level, current):
+        """
+        把尚未级联到 level 层的数据并入 current
+        （即各细层开放桶中属于 current 时间范围的部分，由粗到细依次合并）
+        """
+        for finer in reversed(self.tiers[:level]):
+            b = finer.open
+            if b is not None and current.start <= b.start < current.start + current.resolution:
+                current.merge(b)
+
+
+def merge_same_start(buckets):
+    """合并按时间排序的桶列表中 start 相同的相邻桶（重启前后的同一时段）"""
+    merged = []
+    for b in buckets:
+        if merged and merged[-1].start == b.start:
+            merged[-1].merge(b)
+        else:
+            merged.append(b)
+    return merged
+
+
+# ==========================================================
+# 多设备存储
+# ==========================================================
+
+class RollupStore:
+    """
+    按 device_id 管理 RollupSeries
+
+    path 不为空时持久化：每层一个只追加的 JSONL 文件 (rollup_<分辨率>s.jsonl)，
+    每封闭一个桶写一行；启动时读回各层保留期内的桶并压缩文件，
+    因此 Agent 频繁重启也不会丢失长期分层数据
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, max_hold=60.0, path=None):
+        self.tiers = tiers
+        self.max_hold = max_hold
+        self.path = path
+        self.series = {}
+        self._files = []
+        if path:
+            os.makedirs(path, exist_ok=True)
+            for level, (res, _) in enumerate(tiers):
+                file_path = os.path.join(path, f"rollup_{int(res)}s.jsonl")
+                self._load(level, file_path)
+                self._files.append(open(file_path, "a", encoding="utf-8"))
+
+    def _get_series(self, device_id):
+        series = self.series.get(device_id)
+        if series is None:
+            on_close = functools.partial(self._persist, device_id) if self.path else None
+            series = self.series[device_id] = RollupSeries(self.tiers, self.max_hold, on_close)
+        return series
+
+    def add(self, device_id, t, value, high=False):
+        self._get_series(device_id).add(t, value, high)
+
+    # ------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------
+
+    def _persist(self, device_id, level, bucket):
+        f = self._files[level]
+        f.write(json.dumps({"device_id": device_id, **asdict(bucket)}) + "\n")
+        f.flush()
+
+    def _load(self, level, file_path):
+        """读回一层的已封闭桶，并把文件压缩为仅含保留期内的桶"""
+        if not os.path.exists(file_path):
+            return
+        per_device = {}
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    device_id = record.pop("device_id")
+                    per_device.setdefault(device_id, []).append(RollupBucket(**record))
+                except (ValueError, TypeError, KeyError):
+                    # 进程被强杀时最后一行可能不完整
+                    continue
+
+        for device_id, buckets in per_device.items():
+            buckets.sort(key=lambda b: b.start)
+            self._get_series(device_id).tiers[level].closed.extend(merge_same_start(buckets))
+
+        tmp = f"{file_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for device_id, series in self.series.items():
+                for b in series.tiers[level].closed:
+                    f.write(json.dumps({"device_id": device_id, **asdict(b)}) + "\n")
+        os.replace(tmp, file_path)
+
+    def close(self):
+        """封闭全部开放桶并写盘"""
+        if not self.path:
+            return
+        for series in self.series.values():
+            series.close()
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def query(self, device_id, start, end, step=None, max_points=300):
+        series = self.series.get(device_id)
+        if series is None:
+            return []
+        return series.query(start, end, step, max_points)
+
+    def ingest_csv(self, path, base_time=None):
+        """
+        导入 demo/havfs_experiment.py 或 CSVReporter 记录的 CSV
+        使用列：epoch (采样时刻, epoch s), device_id, utilization, state
+
+        没有 epoch 列的旧文件只有相对运行开始的 time 列，需给出 base_time (运行开始的 epoch s)，
+        否则不同运行会落在同一时间段 (1970 年) 的桶里
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            has_epoch = "epoch" in (reader.fieldnames or [])
+            if not has_epoch and base_time is None:
+                raise ValueError(f"{path} has no 'epoch' column; pass base_time (run start, epoch s)")
+            for row in reader:
+                t = float(row["epoch"]) if has_epoch else base_time + float(row["time"])
+                self.add(
+                    row["device_id"],
+                    t,
+                    float(row["utilization"]),
+                    is_high_state(row.get("state"))
+                )
@@ -2,6 +2,7 @@
 
 import argparse
 import csv
+import logging
 import os
 import time
 import psutil
@@ -17,7 +18,8 @@ from core.reporter.prometheus_reporter import PrometheusReporter
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("--mode", choices=["fixed", "havfs"], default="fixed", help="采样模式")
-    parser.add_argument("--device", choices=["cpu", "gpu"], default="cpu", help="设备类型")
+    parser.add_argument("--device", choices=["cpu", "gpu", "sim"], default="cpu", help="设备类型")
+    parser.add_argument("--seed", type=int, default=0, help="模拟负载随机种子 (sim)")
     parser.add_argument("--reporter", choices=["console", "prometheus"], default="console", help="上报方式")
     parser.add_argument("--fixed-interval", type=float, default=2.0)
     parser.add_argument("--t-min", type=float, default=0.5)
@@ -55,12 +57,19 @@ def main():
     os.system('cls' if os.name == 'nt' else 'clear') 
     print(f"\n>>> 毕设实验系统启动 [PID: {os.getpid()}]")
     args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
 
     # 1. 初始化采集器
     if args.device == "gpu":
         print("[信息] 设备类型: GPU (真实/模拟)")
         collector = GPUCollector(device_id="gpu0")
+    elif args.device == "sim":
+        print(f"[信息] 设备类型: 虚拟设备 (合成负载, seed={args.seed})")
+        # 按需导入：只有 sim 设备才需要 numpy
+        from core.collector.sim_collector import SimulatedCollector, VirtualClock, WorkloadSimulator
+        simulator = WorkloadSimulator(1, seed=args.seed, clock=VirtualClock())
+        collector = SimulatedCollector(simulator, device_id="sim0")
     else:
         print("[信息] 设备类型: CPU (真实)")
         collector = CPUCollector(device_id="cpu0")
@@ -88,7 +97,7 @@ def main():
         writer = csv.writer(f)
         writer.writerow([
             "timestamp", "time", "device_id", "utilization", "risk_score", "interval", "state",
-            "overhead_cpu", "overhead_mem_mb"
+            "overhead_cpu", "overhead_mem_mb", "epoch"
         ])
 
         try:
@@ -107,21 +116,22 @@ def main():
 
                 # C. 上报
                 if isinstance(reporter, PrometheusReporter):
-                    reporter.send(metrics, risk, interval)
+                    reporter.send(metrics, risk, interval, state)
                 
                 # D. 开销测量
                 self_cpu = process.cpu_percent(interval=None)
                 self_mem = process.memory_info().rss / 1024 / 1024
 
                 # E. 准备数据
-                now = round(time.time() - start_time, 2)
+                epoch = time.time()
+                now = round(epoch - start_time, 2)
                 current_time_str = datetime.now().strftime("%H:%M:%S.%f")[:-3]
 
                 # F. 记录 CSV
                 writer.writerow([
                     current_time_str,
                     now, metrics.device_id, metrics.utilization, risk, interval, state,
-                    self_cpu, self_mem
+                    self_cpu, self_mem, round(epoch, 3)
                 ])
 
                 # G. 打印
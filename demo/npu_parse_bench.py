@@ -0,0 +1,58 @@
+# demo/npu_parse_bench.py
+# 用假 npu-smi 验证 watch 输出解析的正确性与吞吐（无需 NPU 硬件）
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from core.collector.npu_collector import NPUCollector, NPUSmiStream, parse_watch_line
+
+FAKE_NPU_SMI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools", "fake_npu_smi.py")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--devices", type=int, default=64, help="模拟 NPU 卡数")
+    parser.add_argument("--rounds", type=int, default=2000, help="吞吐测试输出轮数")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    env = dict(os.environ, FAKE_NPU_SMI_DEVICES=str(args.devices), FAKE_NPU_SMI_ROUNDS=str(args.rounds))
+
+    # 1. 吞吐：一次性生成全部输出，只计解析耗时
+    output = subprocess.run(
+        [sys.executable, FAKE_NPU_SMI, "info", "watch", "-d", "0"],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+
+    start = time.perf_counter()
+    rows = [row for row in map(parse_watch_line, output) if row is not None]
+    elapsed = time.perf_counter() - start
+
+    expected = args.devices * args.rounds
+    print(f"[1] 解析吞吐: {len(output)} 行 / {elapsed * 1000:.1f} ms = {len(output) / elapsed:,.0f} 行/s")
+    print(f"    数据行: {len(rows)} (期望 {expected}) -> {'OK' if len(rows) == expected else 'MISMATCH'}")
+
+    # 2. 端到端：常驻流 + 采集器
+    os.environ["FAKE_NPU_SMI_DEVICES"] = str(args.devices)
+    stream = NPUSmiStream(npu_smi=FAKE_NPU_SMI, delay=0.2)
+    collectors = [NPUCollector(device_id=f"npu{i}", npu_id=i, stream=stream) for i in range(args.devices)]
+    start = time.perf_counter()
+    for c in collectors:
+        c.collect()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for c in collectors:
+        m = c.collect()
+    steady = time.perf_counter() - start
+    stream.close()
+    print(f"[2] 首次采集 (含等待首轮输出): {first * 1000:.1f} ms")
+    print(f"    稳态采集 {args.devices} 设备: {steady * 1e6:.0f} us, 示例 {m.device_id}: {m.summary()}")
+
+
+if __name__ == "__main__":
+    main()
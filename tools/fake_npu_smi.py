@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# tools/fake_npu_smi.py
+"""
+假 npu-smi：在没有昇腾 NPU 的 Linux 机器上模拟 `npu-smi info watch` 输出
+
+用法（与真实工具一致的子命令）：
+    python tools/fake_npu_smi.py info watch -d 1
+环境变量：
+    FAKE_NPU_SMI_DEVICES  NPU 卡数 (默认 8)
+    FAKE_NPU_SMI_CHIPS    每卡芯片数 (默认 1)
+    FAKE_NPU_SMI_ROUNDS   输出轮数，0 表示无限 (默认 0)
+    FAKE_NPU_SMI_SEED     随机种子 (默认 0)
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+HEADER = (
+    "NpuID(Idx)  ChipId(Idx) Pwr(W)      Temp(C)     AI Core(%)  AI Cpu(%)   "
+    "Ctrl Cpu(%) Memory(%)   Memory BW(%)"
+)
+
+
+class _Chip:
+    """单芯片负载：随机游走 + 偶发突发，温度/功耗随负载惯性变化"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.util = rng.uniform(0, 40)
+        self.temp = rng.uniform(38, 45)
+        self.memory = rng.uniform(5, 60)
+        self.burst = 0
+
+    def step(self):
+        rng = self.rng
+        if self.burst > 0:
+            self.burst -= 1
+            target = rng.uniform(85, 100)
+        else:
+            if rng.random() < 0.02:
+                self.burst = rng.randint(3, 20)
+            target = self.util + rng.gauss(0, 4)
+        self.util = min(100.0, max(0.0, 0.7 * self.util + 0.3 * target))
+        self.temp += 0.1 * (38 + 0.35 * self.util - self.temp)
+        self.memory = min(95.0, max(3.0, self.memory + rng.gauss(0, 0.5)))
+        power = 70.0 + 2.4 * self.util + rng.uniform(-2, 2)
+        aicpu = int(self.util * 0.05)
+        ctrlcpu = rng.randint(1, 6)
+        membw = int(self.util * 0.6)
+        return (f"{power:<12.1f}{int(self.temp):<12d}{int(self.util):<12d}{aicpu:<12d}"
+                f"{ctrlcpu:<12d}{int(self.memory):<12d}{membw:<12d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="npu-smi")
+    parser.add_argument("command", choices=["info"])
+    parser.add_argument("sub", choices=["watch"])
+    parser.add_argument("-d", "--delay", type=float, default=1.0)
+    parser.add_argument("-i", "--card", type=int, default=None)
+    parser.add_argument("-c", "--chip", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    devices = int(os.environ.get("FAKE_NPU_SMI_DEVICES", "8"))
+    chips = int(os.environ.get("FAKE_NPU_SMI_CHIPS", "1"))
+    rounds = int(os.environ.get("FAKE_NPU_SMI_ROUNDS", "0"))
+    rng = random.Random(int(os.environ.get("FAKE_NPU_SMI_SEED", "0")))
+
+    targets = [
+        (npu, chip, _Chip(rng))
+        for npu in range(devices) for chip in range(chips)
+        if (args.card is None or npu == args.card) and (args.chip is None or chip == args.chip)
+    ]
+
+    out = sys.stdout
+    out.write(HEADER + "\n")
+    n = 0
+    try:
+        while rounds == 0 or n < rounds:
+            out.write("".join(f"{npu:<12d}{chip:<12d}{c.step()}\n" for npu, chip, c in targets))
+            out.flush()
+            n += 1
+            if args.delay > 0:
+                time.sleep(args.delay)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())